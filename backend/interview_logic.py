@@ -1,63 +1,292 @@
+import asyncio
+import hashlib
+import logging
 import os
+import re
 import uuid
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 
-import requests
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
 
 # -------- Groq config --------
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
-# Use a valid Groq model name you have access to:
-GROQ_MODEL = "llama-3.3-70b-versatile"
+# Use valid Groq model names you have access to.
+# "default" drives the interview itself; "cheap" handles summarization chores.
+GROQ_MODELS = {
+    "default": "llama-3.3-70b-versatile",
+    "cheap": "llama-3.1-8b-instant",
+}
+
+# Shared async HTTP client so connections to Groq are reused (HTTP/2 keep-alive)
+# across turns and concurrent interviews never tie up a worker thread
+GROQ_RETRIES = 2
+GROQ_RETRY_BACKOFF = 0.2
+GROQ_RETRY_STATUSES = {429, 502, 503, 504}
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """
+    Create the shared Groq client on first use, checking the API key then
+    (not at import, so the module imports cleanly without it).
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        if not GROQ_API_KEY:
+            raise RuntimeError("GROQ_API_KEY environment variable not set")
+        _CLIENT = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {GROQ_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            timeout=60,
+            # retries here only cover connection failures; call_groq retries on status
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                retries=GROQ_RETRIES,
+            ),
+        )
+    return _CLIENT
 
-if not GROQ_API_KEY:
-    raise RuntimeError("GROQ_API_KEY environment variable not set")
 
-# In-memory interview store
-INTERVIEWS: Dict[str, Dict[str, Any]] = {}
+async def close_http_client() -> None:
+    """
+    Close the shared Groq client (call on app shutdown).
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+# Interview store: Redis when REDIS_URL is set (shared across workers), else in-memory
+REDIS_URL = os.getenv("REDIS_URL")
+INTERVIEW_TTL_SECONDS = 2 * 60 * 60
 
 
-def call_groq(messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+class InterviewStore:
+    """
+    Interview state keyed by interview_id.
+    With a Redis URL, states are stored as JSON under "iv:<id>" with a TTL so
+    any worker can serve any interview; otherwise they live in a local dict.
+    """
+
+    def __init__(self, url: str | None = None, ttl: int = INTERVIEW_TTL_SECONDS):
+        self._ttl = ttl
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._redis = None
+        if url:
+            import redis.asyncio as redis
+
+            self._redis = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _key(interview_id: str) -> str:
+        return f"iv:{interview_id}"
+
+    async def create(self, interview_id: str, state: Dict[str, Any]) -> bool:
+        """
+        Store a new interview; returns False if the id is already taken.
+        """
+        if self._redis is None:
+            if interview_id in self._local:
+                return False
+            self._local[interview_id] = state
+            return True
+        return bool(await self._redis.set(
+            self._key(interview_id), orjson.dumps(state), nx=True, ex=self._ttl
+        ))
+
+    async def get(self, interview_id: str) -> Optional[Dict[str, Any]]:
+        if self._redis is None:
+            return self._local.get(interview_id)
+        raw = await self._redis.get(self._key(interview_id))
+        return orjson.loads(raw) if raw is not None else None
+
+    async def save(self, interview_id: str, state: Dict[str, Any]) -> None:
+        if self._redis is None:
+            self._local[interview_id] = state
+            return
+        await self._redis.set(self._key(interview_id), orjson.dumps(state), ex=self._ttl)
+
+    async def aclose(self) -> None:
+        """
+        Close the Redis connection pool, if any (call on app shutdown).
+        """
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+INTERVIEWS = InterviewStore(REDIS_URL)
+
+# Cache of resume summaries keyed by a hash of the normalized full text, so a
+# re-uploaded resume (re-pasted, different spacing or case) skips the Groq call.
+# Embedding similarity is deliberately not used: all-MiniLM-L6-v2 truncates
+# input at 256 word pieces, so resumes that differ only further down (new
+# projects, or two candidates built from one template) would share a summary.
+RESUME_CACHE_MAX = 256
+_RESUME_CACHE: Dict[str, str] = {}
+
+# One transcript turn, as rendered in prompts
+_QA_FMT = "Q%d: %s\nA%d: %s"
+
+# Next-question prompts keep this many recent turns verbatim (up to 2x before
+# the older ones are folded into a rolling summary)
+HISTORY_WINDOW = 4
+
+# Sentences the feedback must never contain. _strip_banned removes the whole
+# sentence holding a phrase: from line start (keeping any "• " bullet) or the
+# previous sentence end up to its own terminator. Only .!? followed by a space
+# or the line end ends a sentence, so "7.5/10", "Node.js", "..." / "…" and
+# abbreviations such as "e.g." stay inside one.
+_BANNED_PHRASES = (
+    r"this will help me understand|this might help me understand|this helps us evaluate"
+    r"|let['’]s explore that together|i want to know|this will give me insight"
+    r"|this might help|let['’]s break it down"
+)
+_SENTENCE_CHAR = (
+    r"(?:\b(?:e\.g|i\.e|vs|approx|incl|cf|mr|mrs|ms|dr)\."
+    r"|[^.!?…\n]|\.\.\.|…|[.!?](?![ \t]|$))"
+)
+_BANNED_RE = re.compile(
+    r"(?P<lead>^[ \t]*(?:•[ \t]*)?|(?<=[.!?])[ \t]+)"
+    + _SENTENCE_CHAR + r"*?\b(?:" + _BANNED_PHRASES + r")\b"
+    + _SENTENCE_CHAR + r"*[.!?]*[ \t]*",
+    re.IGNORECASE,
+)
+
+# Resume summaries computed in the background while the intro question is answered.
+# A finished job is dropped after the interview TTL if no next_step collected it.
+_RESUME_JOBS: Dict[str, "asyncio.Task[str]"] = {}
+
+# Per-interview locks: turns of one interview run one at a time, different
+# interviews stay concurrent (per process; a Redis deployment shares state, not locks)
+_LOCKS: Dict[str, asyncio.Lock] = {}
+
+# Follow-up heuristic: short answers or explicit uncertainty
+_MIN_WORDS = 15
+_FOLLOWUP_RE = re.compile(r"\b(?:don't know|not sure|no idea|can't say)\b", re.IGNORECASE)
+
+
+async def call_groq(
+    messages: List[Dict[str, str]],
+    temperature: float = 0.7,
+    json_mode: bool = False,
+    model: str = "default",
+) -> str:
     """
     Simple wrapper to call Groq chat completions.
+    `model` is a key of GROQ_MODELS. With json_mode=True the model is
+    constrained to return a JSON object.
     """
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json",
-    }
     payload = {
-        "model": GROQ_MODEL,
+        "model": GROQ_MODELS[model],
         "messages": messages,
         "temperature": temperature,
     }
-    resp = requests.post(GROQ_URL, json=payload, headers=headers, timeout=60)
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    client = _get_client()
+    body = orjson.dumps(payload)
+    for attempt in range(GROQ_RETRIES + 1):
+        resp = await client.post(GROQ_URL, content=body)
+        if resp.status_code not in GROQ_RETRY_STATUSES or attempt == GROQ_RETRIES:
+            break
+        await asyncio.sleep(GROQ_RETRY_BACKOFF * 2 ** attempt)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     # Expect standard OpenAI/Groq style response
     return data["choices"][0]["message"]["content"].strip()
 
 
-def _build_role_name(role: str, custom_role: str | None) -> str:
-    if role == "Custom" and custom_role:
-        return custom_role.strip()
-    return role
+async def call_groq_stream(
+    messages: List[Dict[str, str]], temperature: float = 0.7, model: str = "default"
+) -> AsyncIterator[str]:
+    """
+    Like call_groq, but yields content deltas as Groq streams them (SSE).
+    """
+    payload = {
+        "model": GROQ_MODELS[model],
+        "messages": messages,
+        "temperature": temperature,
+        "stream": True,
+    }
+    async with _get_client().stream("POST", GROQ_URL, content=orjson.dumps(payload)) as resp:
+        resp.raise_for_status()
+        async for chunk in _sse_data(resp):
+            if chunk == b"[DONE]":
+                break
+            # Groq reports mid-stream failures as a data line with an "error" object
+            if b'"error"' in chunk:
+                error = orjson.loads(chunk).get("error")
+                if error:
+                    message = error.get("message") if isinstance(error, dict) else error
+                    raise RuntimeError(f"Groq stream error: {message}")
+            # Role-only and usage-only chunks carry no text; skip decoding them
+            if b'"content"' not in chunk:
+                continue
+            delta = orjson.loads(chunk)["choices"][0]["delta"].get("content")
+            if delta:
+                yield delta
+
+
+async def _sse_data(resp: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield the raw payload of each "data:" line of an SSE response.
+    Lines are split on bytes so orjson parses them without a str round-trip.
+    """
+    buf = b""
+    async for piece in resp.aiter_bytes():
+        buf += piece
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.startswith(b"data:"):
+                yield line[5:].strip()
+    if buf.startswith(b"data:"):
+        yield buf[5:].strip()
 
 
-def _system_prompt(
-    role: str,
-    experience: str,
-    style: str,
-    resume_summary: str | None = None,
-) -> str:
-    extra = ""
-    if resume_summary:
-        extra = (
-            "\n\nHere is a summary of the candidate's resume and key skills:\n"
-            f"{resume_summary}\n\n"
-            "Use this to ask questions about their projects, responsibilities, tools and achievements."
-        )
+def _resume_key(resume_text: str) -> str:
+    normalized = " ".join(resume_text.split()).casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    return f"""
+
+async def _summarize_resume(resume_text: str) -> str:
+    """
+    Summarize a resume with Groq, reusing the cached summary when the same
+    resume text (ignoring whitespace and case) was seen before.
+    """
+    key = _resume_key(resume_text)
+    cached = _RESUME_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    messages = [
+        {
+            "role": "system",
+            "content": "You are an expert career coach. Summarize resumes and extract key skills."
+        },
+        {
+            "role": "user",
+            "content": f"Here is the candidate's resume:\n\n{resume_text}\n\n"
+                       "Summarize their profile in 4–6 bullet points and list their main skills."
+        },
+    ]
+    summary = await call_groq(messages, temperature=0.3, model="cheap")
+
+    _RESUME_CACHE[key] = summary
+    if len(_RESUME_CACHE) > RESUME_CACHE_MAX:
+        # dicts keep insertion order: drop the oldest entry
+        del _RESUME_CACHE[next(iter(_RESUME_CACHE))]
+    return summary
+
+
+# -------- Prompt templates (str.format_map placeholders) --------
+_SYSTEM_TMPL = """
 You are an intelligent but HUMAN-LIKE job interviewer for the role: {role}.
 The candidate experience level is: {experience}.
 
@@ -65,7 +294,7 @@ Interviewer style: {style}.
 - If style is 'Supportive', be friendly, encouraging, and add short positive reactions ("that's great", "nice example") before questions.
 - If style is 'Strict', be concise, firm, and professional but not rude.
 
-{extra}
+If the message includes a summary of the candidate's resume and key skills, use it to ask questions about their projects, responsibilities, tools and achievements.
 
 Question strategy:
 - Ask ONE question at a time.
@@ -78,31 +307,289 @@ Question strategy:
 - Do NOT give overall feedback during the interview. Feedback is only at the end.
 """.strip()
 
+# Next-question prompts, one per kind of turn
+_INTRO_TURN_TMPL = """
+Here is the candidate's self-introduction and first answer:
+
+{history}
+
+Resume summary (if provided):
+{resume_summary}
+
+As a human interviewer:
+- Write one brief acknowledgement of their introduction (1 short sentence, e.g., "Thanks for sharing that.").
+- THEN write TWO questions; they will be asked one at a time, in order.
+- If a resume summary is present, both questions should explicitly reference items from the resume (project names, certifications, tools, or specific results).
+  Example phrasings:
+    "Your resume says you worked on <project name> — can you describe your role and the main technical challenge?"
+    "I see you used <tool/tech> on that project; which part did you implement and how did you measure success?"
+- If NO resume was provided, make both questions role-relevant follow-ups to their introduction.
+Keep each question short (1–2 sentences). Do NOT provide feedback or extra commentary.
+
+{reply_format}
+""".strip()
+
+# Reply formats for the post-intro turn; plain text is the fallback when the
+# JSON reply is unusable
+_INTRO_JSON_FORMAT = """Respond with JSON only, in exactly this shape:
+{"ack": "<acknowledgement>", "questions": ["<question 1>", "<question 2>"]}"""
+_INTRO_PLAIN_FORMAT = (
+    "Reply in plain text with only the acknowledgement followed by the FIRST question."
+)
+
+_FOLLOWUP_TURN_TMPL = """
+Here is the interview so far:
+
+{history}{resume_part}
+
+The candidate's last answer seems short or uncertain.
+
+As a human interviewer:
+- Start with a very brief reaction to their last answer (1 short sentence).
+- Then ask ONE follow-up question that digs deeper into the SAME topic.
+- If relevant, tie it to their resume or previous answers.
+Total 1–2 sentences. No overall feedback.
+""".strip()
+
+_NEXT_TURN_TMPL = """
+Here is the interview so far:
+
+{history}{resume_part}
+
+Now, as a human interviewer for {role_name}:
+- Start with a very brief acknowledgment of the last answer (1 short sentence).
+- Then ask the NEXT interview question.
+- Mix focus between:
+  1) their resume / past projects (if you have resume summary),
+  2) skills needed for {role_name},
+  3) general behavioral questions (teamwork, challenges, learning, etc.).
+Ask only ONE question this turn. Total 1–2 sentences. No overall feedback.
+""".strip()
+
+
+# Post-interview feedback system prompt
+_FEEDBACK_SYSTEM_TMPL = """
+You are a REAL human interviewer conducting a professional job interview.
+Your tone must be natural, concise, human-like, and role-appropriate.
+
+HARD BANNED PHRASES (never use, not even reworded): “This will help me understand”,
+“This might help me understand”, “This helps us evaluate”, “Let’s explore that together”,
+“I want to know”, “This will give me insight”, “This might help”, “Let’s break it down”.
+
+CANDIDATE DETAILS:
+- Name: {candidate_name}
+- Role: {role_name}
+- Experience: {experience}
+- Style: {style}
+- Resume: {resume_summary}
+
+GREETING:
+- Start with a simple greeting using the candidate’s name (if available).
+- Example: “Hi {candidate_name}, nice to meet you. Let’s begin.”
+
+QUESTION RULES:
+- Ask ONE question at a time.
+- Keep questions short and human.
+- Never justify why you are asking the question.
+- Never explain your evaluation process.
+- Never use teacher-like, mentor-like, or coach-like phrasing.
+
+FOLLOW-UP LOGIC:
+- If the answer is unclear or short → ask a natural follow-up.
+- If the candidate says “no”, “I don’t know”, or refuses:
+    - Supportive mode → politely move on.
+    - Strict mode → warn once, then move on.
+- Do NOT repeat questions.
+
+TONE RULES:
+Supportive → warm, encouraging, light fillers (Alright, Got it, Sounds good)
+Strict → crisp, minimal fillers, professional, firm
+
+ROLE ADAPTATION:
+Ask a mix of behavioral + technical questions based on:
+- role
+- resume (if provided)
+- experience level
+
+ENDING:
+If this is the LAST question:
+Say exactly:
+“Thank you for your time, {candidate_name}. This concludes the interview.”
+
+IMPORTANT:
+This function must only GENERATE POST-INTERVIEW FEEDBACK.
+Return plain text with emoji headers exactly as requested below.
+""".strip()
+
+
+def _build_role_name(role: str, custom_role: str | None) -> str:
+    if role == "Custom" and custom_role:
+        return custom_role.strip()
+    return role
+
+
+def _system_prompt(role: str, experience: str, style: str) -> str:
+    # Only interview settings go here, so the system message is a fixed,
+    # cacheable prefix from the first turn; the resume summary (which arrives
+    # later, from the background job) travels in the user message instead.
+    return _SYSTEM_TMPL.format_map(
+        {"role": role, "experience": experience, "style": style}
+    )
+
+
+def _resume_part(resume_summary: str | None) -> str:
+    if not resume_summary:
+        return ""
+    return f"\n\nHere is a summary of the candidate's resume and key skills:\n{resume_summary}"
+
+
+def _build_feedback_system_prompt(
+    role: str,
+    experience: str,
+    style: str,
+    resume_summary: str | None,
+    candidate_name: str | None,
+) -> str:
+    return _FEEDBACK_SYSTEM_TMPL.format_map({
+        "role_name": role,
+        "experience": experience,
+        "style": style,
+        "resume_summary": resume_summary or "",
+        "candidate_name": candidate_name or "",
+    })
+
+
+def _history_text(qa: List[Dict[str, str]], start: int = 1) -> str:
+    """
+    Convert Q/A pairs to readable history, numbering from `start`.
+    """
+    return "\n\n".join(
+        _QA_FMT % (i, p["question"], i, p["answer"]) for i, p in enumerate(qa, start)
+    )
+
+
+async def _refresh_rolling_summary(state: Dict[str, Any]) -> None:
+    """
+    Once 2*HISTORY_WINDOW turns are unsummarized, fold all but the last
+    HISTORY_WINDOW of them into state["rolling_summary"] with one cheap call.
+    If the call fails the state is left as is and the turn goes on with the
+    previous summary (or the verbatim history); the next turn retries.
+    """
+    qa = state["qa"]
+    done = state.get("summarized_turns", 0)
+    if len(qa) - done < 2 * HISTORY_WINDOW:
+        return
+    upto = len(qa) - HISTORY_WINDOW
+    previous = state.get("rolling_summary") or "None yet."
+    messages = [
+        {
+            "role": "system",
+            "content": "You summarize job interview transcripts briefly and factually."
+        },
+        {
+            "role": "user",
+            "content": f"Summary of the interview so far:\n{previous}\n\n"
+                       f"Newer turns:\n{_history_text(qa[done:upto], start=done + 1)}\n\n"
+                       "Write an updated summary in 3–6 short bullet points: topics covered, "
+                       "key claims and examples the candidate gave, and any weak or evasive answers. "
+                       "Return only the summary."
+        },
+    ]
+    try:
+        summary = await call_groq(messages, temperature=0.2, model="cheap")
+    except Exception:
+        logger.warning("Rolling summary failed, keeping the previous one", exc_info=True)
+        return
+    state["rolling_summary"] = summary
+    state["summarized_turns"] = upto
+
+
+def _prompt_history(state: Dict[str, Any]) -> str:
+    """
+    Transcript for the next-question prompt: the rolling summary of earlier
+    turns plus the recent turns verbatim, so prompt size stays bounded.
+    """
+    done = state.get("summarized_turns", 0)
+    if not done:
+        return state["history_text"]
+    recent = _history_text(state["qa"][done:], start=done + 1)
+    return f"Summary of earlier turns:\n{state['rolling_summary']}\n\n{recent}"
+
+
+def _lock_for(interview_id: str) -> asyncio.Lock:
+    return _LOCKS.setdefault(interview_id, asyncio.Lock())
+
 
-def _history_text(qa: List[Dict[str, str]]) -> str:
+def _unlock(interview_id: str, lock: asyncio.Lock, forget: bool) -> None:
     """
-    Convert Q/A pairs to readable history.
+    Release an interview lock; forget it once the interview is finished
+    (or was never found) so the table does not grow without bound.
+    """
+    lock.release()
+    if forget and _LOCKS.get(interview_id) is lock:
+        del _LOCKS[interview_id]
+
+
+def _question_text(item: Any) -> str:
+    """
+    A question from the JSON reply: a string, or an object holding one
+    under "question"/"text".
+    """
+    if isinstance(item, dict):
+        item = item.get("question") or item.get("text")
+    return item.strip() if isinstance(item, str) else ""
+
+
+def _split_intro_reply(reply: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Parse the post-intro JSON reply {"ack": ..., "questions": [...]} into the
+    question to ask now (ack + first question) and the questions to ask later.
+    Tolerates a null/missing ack, a singular "question" key, a string instead
+    of a list and question objects; returns None when no question is found.
+    """
+    try:
+        data = orjson.loads(reply)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    ack = data.get("ack")
+    ack = ack.strip() if isinstance(ack, str) else ""
+    questions = data.get("questions", data.get("question"))
+    if not isinstance(questions, list):
+        questions = [questions]
+    questions = [q for q in map(_question_text, questions) if q]
+    if not questions:
+        return None
+    first = f"{ack} {questions[0]}" if ack else questions[0]
+    return first, questions[1:]
+
+
+def _strip_banned(text: str) -> str:
+    """
+    Remove every sentence containing a banned phrase; lines left empty
+    (or holding only a bullet) by the removal are dropped.
     """
     out = []
-    for i, pair in enumerate(qa, start=1):
-        out.append(f"Q{i}: {pair['question']}\nA{i}: {pair['answer']}")
-    return "\n\n".join(out)
+    for line in text.split("\n"):
+        cleaned = _BANNED_RE.sub(r"\g<lead>", line).rstrip()
+        if line.strip() and cleaned.strip() in ("", "•"):
+            continue
+        out.append(cleaned)
+    return "\n".join(out).strip()
 
 
 def _needs_followup(answer: str) -> bool:
     """
     Heuristic to decide if we should ask a follow-up instead of moving on.
     """
-    ans = answer.lower()
-    if len(answer.split()) < 15:
+    # maxsplit stops splitting once we know the answer is long enough
+    if len(answer.split(None, _MIN_WORDS)) < _MIN_WORDS:
         return True
-    for phrase in ["don't know", "not sure", "no idea", "can't say"]:
-        if phrase in ans:
-            return True
-    return False
+    return _FOLLOWUP_RE.search(answer) is not None
 
 
-def start_interview(
+async def start_interview(
     role: str,
     custom_role: str | None,
     experience: str,
@@ -115,24 +602,16 @@ def start_interview(
     """
     role_name = _build_role_name(role, custom_role)
 
-    # Optional: summarize resume once
-    resume_summary = None
-    if resume_text and resume_text.strip():
-        messages = [
-            {
-                "role": "system",
-                "content": "You are an expert career coach. Summarize resumes and extract key skills."
-            },
-            {
-                "role": "user",
-                "content": f"Here is the candidate's resume:\n\n{resume_text}\n\n"
-                           "Summarize their profile in 4–6 bullet points and list their main skills."
-            },
-        ]
-        resume_summary = call_groq(messages, temperature=0.3)
+    # Optional: summarize resume once, in the background (the intro question
+    # does not need it); the first next_step waits for the result
+    has_resume = bool(resume_text and resume_text.strip())
 
-    # Build system prompt (used later in next_step)
-    system_prompt = _system_prompt(role_name, experience, style, resume_summary)
+    # Build system prompts (used later in next_step; the feedback one is
+    # rebuilt once the summary lands)
+    system_prompt = _system_prompt(role_name, experience, style)
+    feedback_system_prompt = _build_feedback_system_prompt(
+        role_name, experience, style, None, None
+    )
 
     # First question: self-introduction (human style)
     intro_question = (
@@ -146,38 +625,105 @@ def start_interview(
     else:
         effective_max = int(max_questions)
 
-    interview_id = str(uuid.uuid4())
-    INTERVIEWS[interview_id] = {
+    interview_id = uuid.uuid4().hex
+    state = {
         "role": role_name,
         "experience": experience,
         "style": style,
         "max_questions": effective_max,   # <-- use effective_max here
         "qa": [],
+        "history_text": "",   # running transcript, extended one Q/A per turn
+        "pending_questions": [],   # questions generated ahead of time
+        "rolling_summary": "",   # summary of turns older than the prompt window
+        "summarized_turns": 0,
         "current_question": intro_question,
         "done": False,
-        "resume_summary": resume_summary,
+        "resume_summary": None,
+        "resume_text": resume_text if has_resume else None,   # kept until summarized
+        "system_prompt": system_prompt,   # fixed for the whole interview
+        "feedback_system_prompt": feedback_system_prompt,
+        "feedback_prompt_name": "",   # candidate name the feedback prompt was built with
         "candidate_name": None,    # <<-- ADD THIS LINE
     }
+    if not await INTERVIEWS.create(interview_id, state):
+        raise RuntimeError("Interview id collision, please retry")
+    if has_resume:
+        job = asyncio.create_task(_summarize_resume(resume_text))
+        job.add_done_callback(lambda task: _resume_job_done(interview_id, task))
+        _RESUME_JOBS[interview_id] = job
 
     return {"interview_id": interview_id, "question": intro_question}
 
 
 
-def next_step(interview_id: str, answer: str | None, end: bool = False) -> Dict[str, Any]:
+def _resume_job_done(interview_id: str, task: "asyncio.Task[str]") -> None:
     """
-    Process an answer and either return next question or final feedback.
-    If end=True, finish early and generate feedback from current QA.
+    Log a failed background summary and schedule the job's removal, so
+    interviews that are abandoned after start do not keep it forever.
     """
-    if interview_id not in INTERVIEWS:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background resume summary failed for %s", interview_id,
+                       exc_info=task.exception())
+
+    def forget() -> None:
+        if _RESUME_JOBS.get(interview_id) is task:
+            del _RESUME_JOBS[interview_id]
+
+    asyncio.get_running_loop().call_later(INTERVIEW_TTL_SECONDS, forget)
+
+
+async def _join_resume_summary(interview_id: str, state: Dict[str, Any]) -> None:
+    """
+    Wait for the background resume summary and rebuild the feedback prompt.
+    If the job ran on another worker (or failed), summarize here instead.
+    """
+    resume_text = state.get("resume_text")
+    if not resume_text:
+        return
+    job = _RESUME_JOBS.get(interview_id)
+    summary = None
+    if job is not None:
+        try:
+            # shield: a cancelled request must not cancel the shared job
+            summary = await asyncio.shield(job)
+        except asyncio.CancelledError:
+            if not job.cancelled():
+                raise  # this request was cancelled, not the job
+        except Exception:
+            pass  # already logged by _resume_job_done; retry below
+        _RESUME_JOBS.pop(interview_id, None)
+    if summary is None:
+        summary = await _summarize_resume(resume_text)
+    state["resume_summary"] = summary
+    state["resume_text"] = None
+    candidate_name = state.get("candidate_name") or ""
+    state["feedback_system_prompt"] = _build_feedback_system_prompt(
+        state["role"], state["experience"], state["style"], summary, candidate_name
+    )
+    state["feedback_prompt_name"] = candidate_name
+
+
+async def _prepare_turn(
+    interview_id: str, answer: str | None, end: bool
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[List[Dict[str, str]]]]:
+    """
+    Record the answer and work out the next turn.
+    Returns (state, result, messages): result is set when the turn is already
+    decided (finished, feedback, queued question); otherwise messages is the
+    Groq prompt for the next question.
+    """
+    state = await INTERVIEWS.get(interview_id)
+    if state is None:
         raise KeyError("Interview not found")
 
-    state = INTERVIEWS[interview_id]
     if state["done"]:
-        return {
+        return state, {
             "done": True,
             "nextQuestion": None,
             "feedbackMarkdown": "Interview already finished.",
-        }
+        }, None
+
+    await _join_resume_summary(interview_id, state)
 
     qa: List[Dict[str, str]] = state["qa"]
     current_q = state["current_question"]
@@ -185,12 +731,16 @@ def next_step(interview_id: str, answer: str | None, end: bool = False) -> Dict[
     # Store answer
     if answer is not None and answer.strip() and current_q:
         qa.append({"question": current_q, "answer": answer.strip()})
+        i = len(qa)
+        block = _QA_FMT % (i, current_q, i, qa[-1]["answer"])
+        prev = state["history_text"]
+        state["history_text"] = prev + ("\n\n" if prev else "") + block
 
     # Decide if we should end now
     if end or len(qa) >= state["max_questions"]:
     # Generate feedback (wrap in try to avoid exceptions bubbling up)
         try:
-            feedback = _generate_feedback(state)
+            feedback = await _generate_feedback(state)
             if feedback is None:
                 feedback = "No feedback available."
         except Exception as e:
@@ -204,89 +754,156 @@ def next_step(interview_id: str, answer: str | None, end: bool = False) -> Dict[
         # mark interview done and clear current question
         state["done"] = True
         state["current_question"] = None
+        await INTERVIEWS.save(interview_id, state)
 
         # Return both the closing message (so UI can show it) and the feedback
-        return {
+        return state, {
             "done": True,
             "nextQuestion": closing_msg,
             "feedbackMarkdown": feedback,
-        }
+        }, None
 
 
     # Build context for next question
-    history = _history_text(qa)
     role_name = state["role"]
-    experience = state["experience"]
-    style = state["style"]
     resume_summary = state.get("resume_summary")
-    system_prompt = _system_prompt(role_name, experience, style, resume_summary)
+    # Reuse the prompt built at start so the system prefix is byte-identical every turn
+    system_prompt = state["system_prompt"]
 
     last_answer = qa[-1]["answer"] if qa else ""
     followup = _needs_followup(last_answer)
 
+    # Serve a pre-generated question unless the last answer needs a follow-up
+    pending = state.setdefault("pending_questions", [])
+    if pending and not followup:
+        return state, await _ask(interview_id, state, pending.pop(0)), None
+
+    await _refresh_rolling_summary(state)
+    history = _prompt_history(state)
+
     # User message to Groq
     if len(qa) == 1:
         # Just finished intro answer — force resume-based follow-ups when resume is present
-        user_msg = f"""
-Here is the candidate's self-introduction and first answer:
-
-{history}
-
-Resume summary (if provided):
-{resume_summary if resume_summary else "No resume provided."}
-
-As a human interviewer:
-- Begin with one brief acknowledgement of their introduction (1 short sentence, e.g., "Thanks for sharing that.").
-- THEN, if a resume summary is present, ask TWO targeted follow-up questions that explicitly reference items from the resume (project names, certifications, tools, or specific results).
-  Example phrasings:
-    "Your resume says you worked on <project name> — can you describe your role and the main technical challenge?"
-    "I see you used <tool/tech> on that project; which part did you implement and how did you measure success?"
-- If NO resume was provided, ask ONE role-relevant follow-up question instead.
-Keep each question short (1–2 sentences). Do NOT provide feedback or extra commentary.
-""".strip()
+        user_msg = _INTRO_TURN_TMPL.format_map({
+            "history": history,
+            "resume_summary": resume_summary or "No resume provided.",
+            "reply_format": _INTRO_JSON_FORMAT,
+        })
 
     else:
         if followup:
-            user_msg = f"""
-Here is the interview so far:
-
-{history}
-
-The candidate's last answer seems short or uncertain.
-
-As a human interviewer:
-- Start with a very brief reaction to their last answer (1 short sentence).
-- Then ask ONE follow-up question that digs deeper into the SAME topic.
-- If relevant, tie it to their resume or previous answers.
-Total 1–2 sentences. No overall feedback.
-""".strip()
+            user_msg = _FOLLOWUP_TURN_TMPL.format_map({
+                "history": history,
+                "resume_part": _resume_part(resume_summary),
+            })
         else:
-            user_msg = f"""
-Here is the interview so far:
-
-{history}
-
-Now, as a human interviewer for {role_name}:
-- Start with a very brief acknowledgment of the last answer (1 short sentence).
-- Then ask the NEXT interview question.
-- Mix focus between:
-  1) their resume / past projects (if you have resume summary),
-  2) skills needed for {role_name},
-  3) general behavioral questions (teamwork, challenges, learning, etc.).
-Ask only ONE question this turn. Total 1–2 sentences. No overall feedback.
-""".strip()
+            user_msg = _NEXT_TURN_TMPL.format_map({
+                "history": history,
+                "resume_part": _resume_part(resume_summary),
+                "role_name": role_name,
+            })
 
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_msg},
     ]
-    next_q = call_groq(messages, temperature=0.7)
-    state["current_question"] = next_q
+    return state, None, messages
 
+
+async def _ask(interview_id: str, state: Dict[str, Any], next_q: str) -> Dict[str, Any]:
+    """
+    Make next_q the current question and persist the state. An empty
+    question is never saved: _prepare_turn would drop the next answer.
+    """
+    if not next_q:
+        raise RuntimeError("Groq returned an empty question")
+    state["current_question"] = next_q
+    await INTERVIEWS.save(interview_id, state)
     return {"done": False, "nextQuestion": next_q, "feedbackMarkdown": None}
 
 
-def _generate_feedback(state: Dict[str, Any]) -> str:
+async def _intro_reply(state: Dict[str, Any], messages: List[Dict[str, str]]) -> str:
+    """
+    One call yields the next two questions; the second is queued and later
+    served without calling Groq. If the JSON reply holds no usable question,
+    ask again for a single plain-text question rather than show raw JSON.
+    """
+    parsed = _split_intro_reply(await call_groq(messages, temperature=0.7, json_mode=True))
+    if parsed is not None:
+        next_q, state["pending_questions"] = parsed
+        return next_q
+    plain = messages[:-1] + [{
+        "role": "user",
+        "content": messages[-1]["content"].replace(_INTRO_JSON_FORMAT, _INTRO_PLAIN_FORMAT),
+    }]
+    state["pending_questions"] = []
+    return await call_groq(plain, temperature=0.7)
+
+
+async def next_step(interview_id: str, answer: str | None, end: bool = False) -> Dict[str, Any]:
+    """
+    Process an answer and either return next question or final feedback.
+    If end=True, finish early and generate feedback from current QA.
+    """
+    lock = _lock_for(interview_id)
+    await lock.acquire()
+    forget = False
+    try:
+        try:
+            state, result, messages = await _prepare_turn(interview_id, answer, end)
+        except KeyError:
+            forget = True
+            raise
+        if result is None:
+            if len(state["qa"]) == 1:
+                next_q = await _intro_reply(state, messages)
+            else:
+                next_q = await call_groq(messages, temperature=0.7)
+            result = await _ask(interview_id, state, next_q)
+        forget = state["done"]
+        return result
+    finally:
+        _unlock(interview_id, lock, forget)
+
+
+async def next_step_stream(
+    interview_id: str, answer: str | None, end: bool = False
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of next_step.
+    Yields {"delta": text} events as the question is generated, then one
+    {"result": <next_step dict>} event; a missing interview raises KeyError
+    on the first iteration.
+    The lock is taken inside the generator, so one that is closed before it
+    starts (e.g. the client disconnected) never holds it.
+    """
+    lock = _lock_for(interview_id)
+    await lock.acquire()
+    forget = False
+    try:
+        try:
+            state, result, messages = await _prepare_turn(interview_id, answer, end)
+        except KeyError:
+            forget = True
+            raise
+        if result is None:
+            if len(state["qa"]) == 1:
+                # JSON reply is not useful to show token by token
+                next_q = await _intro_reply(state, messages)
+            else:
+                parts: List[str] = []
+                async for delta in call_groq_stream(messages, temperature=0.7):
+                    parts.append(delta)
+                    yield {"delta": delta}
+                next_q = "".join(parts).strip()
+            result = await _ask(interview_id, state, next_q)
+        forget = state["done"]
+        yield {"result": result}
+    finally:
+        _unlock(interview_id, lock, forget)
+
+
+async def _generate_feedback(state: Dict[str, Any]) -> str:
     """
     Generate structured feedback from full QA transcript.
     Returns PLAIN TEXT with emoji section headers (no markdown symbols).
@@ -301,7 +918,7 @@ def _generate_feedback(state: Dict[str, Any]) -> str:
     candidate_name = state.get("candidate_name", "") or ""
     qa = state.get("qa", [])
 
-    history = _history_text(qa)
+    history = state.get("history_text") or _history_text(qa)
 
     resume_part = ""
     if resume_summary:
@@ -310,74 +927,14 @@ def _generate_feedback(state: Dict[str, Any]) -> str:
             f"{resume_summary}\n"
         )
 
-    system_prompt = f"""
-You are a REAL human interviewer conducting a professional job interview.
-Your tone must be natural, concise, human-like, and role-appropriate.
-
-#############################################
-###  HARD BANNED PHRASES (DO NOT USE EVER) ###
-#############################################
-
-Under NO circumstances should you use ANY sentences like:
-
-- “This will help me understand…” 
-- “This might help me understand…” 
-- “This helps us evaluate…” 
-- “Let’s explore that together…” 
-- “I want to know…” 
-- “This will give me insight…” 
-- “This might help…” 
-- “Let’s break it down…”
-
-If you accidentally produce a sentence that resembles ANY of these patterns,
-IMMEDIATELY rewrite the line in a clean, human way WITHOUT explaining anything.
-
-#############################################
-
-CANDIDATE DETAILS:
-- Name: {candidate_name}
-- Role: {role_name}
-- Experience: {experience}
-- Style: {style}
-- Resume: {resume_summary}
-
-GREETING:
-- Start with a simple greeting using the candidate’s name (if available).
-- Example: “Hi {candidate_name}, nice to meet you. Let’s begin.”
-
-QUESTION RULES:
-- Ask ONE question at a time.
-- Keep questions short and human.
-- Never justify why you are asking the question.
-- Never explain your evaluation process.
-- Never use teacher-like, mentor-like, or coach-like phrasing.
-
-FOLLOW-UP LOGIC:
-- If the answer is unclear or short → ask a natural follow-up.
-- If the candidate says “no”, “I don’t know”, or refuses:
-    - Supportive mode → politely move on.
-    - Strict mode → warn once, then move on.
-- Do NOT repeat questions.
-
-TONE RULES:
-Supportive → warm, encouraging, light fillers (Alright, Got it, Sounds good)
-Strict → crisp, minimal fillers, professional, firm
-
-ROLE ADAPTATION:
-Ask a mix of behavioral + technical questions based on:
-- role
-- resume (if provided)
-- experience level
-
-ENDING:
-If this is the LAST question:
-Say exactly:
-“Thank you for your time, {candidate_name}. This concludes the interview.”
-
-IMPORTANT:
-This function must only GENERATE POST-INTERVIEW FEEDBACK.
-Return plain text with emoji headers exactly as requested below.
-""".strip()
+    # Built at start; rebuilt (and cached again) only if the candidate name changed
+    system_prompt = state.get("feedback_system_prompt")
+    if system_prompt is None or state.get("feedback_prompt_name") != candidate_name:
+        system_prompt = _build_feedback_system_prompt(
+            role_name, experience, style, resume_summary, candidate_name
+        )
+        state["feedback_system_prompt"] = system_prompt
+        state["feedback_prompt_name"] = candidate_name
 
     user_msg = f"""
 Here is the full interview transcript (questions and candidate answers):
@@ -420,11 +977,12 @@ Remember:
 
     # Call the model but guard against exceptions so a readable fallback is returned.
     try:
-        feedback_text = call_groq(messages, temperature=0.4)
+        feedback_text = await call_groq(messages, temperature=0.4)
         # If model returned something falsy, provide fallback
         if not feedback_text or not isinstance(feedback_text, str):
             return "No feedback generated by model."
-        return feedback_text
+        # Drop any sentence containing a banned phrase (enforced here, not in the prompt)
+        return _strip_banned(feedback_text)
     except Exception as e:
         # Return a clear fallback message (this will be shown in UI)
         return f"Feedback generation failed: {str(e)}"
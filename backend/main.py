@@ -1,13 +1,30 @@
 import os
+from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from interview_logic import start_interview, next_step
+from interview_logic import (
+    INTERVIEWS,
+    close_http_client,
+    start_interview,
+    next_step,
+    next_step_stream,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_http_client()
+    await INTERVIEWS.aclose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Allow React dev server
 origins = [
@@ -56,9 +73,9 @@ def health():
 
 
 @app.post("/start-interview", response_model=StartInterviewResponse)
-def api_start_interview(body: StartInterviewRequest):
+async def api_start_interview(body: StartInterviewRequest):
     try:
-        result = start_interview(
+        result = await start_interview(
             role=body.role,
             custom_role=body.customRole,
             experience=body.experience,
@@ -75,10 +92,49 @@ def api_start_interview(body: StartInterviewRequest):
         raise HTTPException(status_code=500, detail=f"start_interview failed: {str(e)}")
 
 
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def _answer_events(events):
+    """
+    Turn next_step_stream events into SSE: "token" events with partial text,
+    then one "done" event carrying the AnswerResponse payload.
+    Closes `events` when done, so a disconnect releases the interview lock.
+    """
+    try:
+        async for ev in events:
+            if "delta" in ev:
+                yield _sse("token", {"text": ev["delta"]})
+            else:
+                result = ev["result"]
+                yield _sse("done", AnswerResponse(
+                    done=result["done"],
+                    nextQuestion=result["nextQuestion"],
+                    feedbackMarkdown=result["feedbackMarkdown"],
+                ).model_dump())
+    except KeyError:
+        yield _sse("error", {"status": 404, "detail": "Interview not found"})
+    except Exception as e:
+        yield _sse("error", {"status": 500, "detail": f"next_step failed: {str(e)}"})
+    finally:
+        await events.aclose()
+
+
 @app.post("/answer", response_model=AnswerResponse)
-def api_answer(body: AnswerRequest):
+async def api_answer(body: AnswerRequest, request: Request):
+    # Clients sending "Accept: text/event-stream" get the question streamed as SSE
+    # (errors, including an unknown interview, arrive as an "error" event)
+    if "text/event-stream" in request.headers.get("accept", ""):
+        events = next_step_stream(
+            interview_id=body.interviewId,
+            answer=body.answer,
+            end=body.end,
+        )
+        return StreamingResponse(_answer_events(events), media_type="text/event-stream")
+
     try:
-        result = next_step(
+        result = await next_step(
             interview_id=body.interviewId,
             answer=body.answer,
             end=body.end,
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+import interview_logic
+from interview_logic import _split_intro_reply, _strip_banned
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        ('{"ack": "Thanks.", "questions": ["A?", "B?"]}', ("Thanks. A?", ["B?"])),
+        ('{"ack": null, "questions": ["a"]}', ("a", [])),
+        ('{"questions": ["a", "b"]}', ("a", ["b"])),
+        ('{"ack": "Thanks.", "question": "A?"}', ("Thanks. A?", [])),
+        ('{"ack": "Thanks.", "questions": "A?"}', ("Thanks. A?", [])),
+        (
+            '{"ack": "Ok.", "questions": [{"question": "A?"}, {"text": "B?"}]}',
+            ("Ok. A?", ["B?"]),
+        ),
+        ('{"ack": 1, "questions": ["a", 2, " "]}', ("a", [])),
+    ],
+)
+def test_split_intro_reply_shapes(reply, expected):
+    assert _split_intro_reply(reply) == expected
+
+
+@pytest.mark.parametrize(
+    "reply",
+    ["not json", "[1, 2]", '{"ack": "Thanks."}', '{"questions": []}', '{"questions": [{}]}'],
+)
+def test_split_intro_reply_without_question(reply):
+    assert _split_intro_reply(reply) is None
+
+
+def test_intro_reply_falls_back_to_plain_question(monkeypatch):
+    calls = []
+
+    async def fake_call_groq(messages, temperature=0.7, json_mode=False, model="default"):
+        calls.append((messages, json_mode))
+        return '{"ack": "Thanks."}' if json_mode else "Thanks. What did you build?"
+
+    monkeypatch.setattr(interview_logic, "call_groq", fake_call_groq)
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "intro\n\n" + interview_logic._INTRO_JSON_FORMAT},
+    ]
+    state = {"pending_questions": ["stale"]}
+
+    next_q = asyncio.run(interview_logic._intro_reply(state, messages))
+
+    assert next_q == "Thanks. What did you build?"
+    assert state["pending_questions"] == []
+    plain_messages, json_mode = calls[1]
+    assert not json_mode
+    assert interview_logic._INTRO_PLAIN_FORMAT in plain_messages[-1]["content"]
+    assert interview_logic._INTRO_JSON_FORMAT not in plain_messages[-1]["content"]
+
+
+def test_empty_streamed_question_is_not_saved(monkeypatch):
+    async def empty_stream(messages, temperature=0.7, model="default"):
+        for delta in (" ", "\n"):
+            yield delta
+
+    async def collect():
+        events = []
+        async for event in interview_logic.next_step_stream(iid, "An answer"):
+            events.append(event)
+        return events
+
+    monkeypatch.setattr(interview_logic, "call_groq_stream", empty_stream)
+    iid = "empty-stream"
+    state = {
+        "role": "Backend Engineer",
+        "max_questions": 5,
+        "qa": [{"question": "Intro?", "answer": "Hi"}],
+        "history_text": "Q1: Intro?\nA1: Hi",
+        "pending_questions": [],
+        "rolling_summary": "",
+        "summarized_turns": 0,
+        "current_question": "What did you build?",
+        "done": False,
+        "resume_summary": None,
+        "resume_text": None,
+        "system_prompt": "sys",
+    }
+    asyncio.run(interview_logic.INTERVIEWS.save(iid, state))
+
+    with pytest.raises(RuntimeError, match="empty question"):
+        asyncio.run(collect())
+    saved = asyncio.run(interview_logic.INTERVIEWS.get(iid))
+    assert saved["current_question"] == "What did you build?"
+
+
+class _FakeStreamResponse:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    async def aiter_bytes(self):
+        yield self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeClient:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def stream(self, method, url, content=None):
+        return _FakeStreamResponse(self._body)
+
+
+def _collect_stream(monkeypatch, body: bytes):
+    async def collect():
+        return [delta async for delta in interview_logic.call_groq_stream([])]
+
+    monkeypatch.setattr(interview_logic, "_get_client", lambda: _FakeClient(body))
+    return asyncio.run(collect())
+
+
+def test_call_groq_stream_yields_content(monkeypatch):
+    body = (
+        b'data: {"choices":[{"delta":{"role":"assistant"}}]}\n\n'
+        b'data: {"choices":[{"delta":{"content":"Tell me "}}]}\n\n'
+        b'data: {"choices":[{"delta":{"content":"about \\"error\\" handling"}}]}\n\n'
+        b"data: [DONE]\n\n"
+    )
+    assert _collect_stream(monkeypatch, body) == ["Tell me ", 'about "error" handling']
+
+
+def test_call_groq_stream_raises_on_error_payload(monkeypatch):
+    body = (
+        b'data: {"choices":[{"delta":{"content":"Tell me "}}]}\n\n'
+        b'data: {"error":{"message":"Service unavailable","type":"internal_server_error"}}\n\n'
+    )
+    with pytest.raises(RuntimeError, match="Service unavailable"):
+        _collect_stream(monkeypatch, body)
+
+
+def test_rolling_summary_failure_keeps_state(monkeypatch):
+    async def failing_call_groq(*args, **kwargs):
+        raise RuntimeError("Groq is down")
+
+    monkeypatch.setattr(interview_logic, "call_groq", failing_call_groq)
+    qa = [{"question": f"Q{i}?", "answer": f"A{i}"} for i in range(12)]
+    state = {"qa": qa, "summarized_turns": 2, "rolling_summary": "Earlier turns."}
+
+    asyncio.run(interview_logic._refresh_rolling_summary(state))
+
+    assert state["summarized_turns"] == 2
+    assert state["rolling_summary"] == "Earlier turns."
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # Ratings and decimals do not end a sentence
+        ("You scored 7.5/10, and this might help you: slow down.", ""),
+        ("Score: 7.5/10. This might help: slow down. Rating 8.5/10.", "Score: 7.5/10. Rating 8.5/10."),
+        ("6/10. I want to know less jargon…, e.g. explain Node.js internals.", "6/10."),
+        # Abbreviations stay inside their sentence
+        ("• Use concrete metrics (e.g. 20% faster) — this might help…", ""),
+        ("Good. Use STAR, i.e. this might help. Keep it short.", "Good. Keep it short."),
+        ("Strong answer. Use Node.js examples, e.g. streams.", "Strong answer. Use Node.js examples, e.g. streams."),
+        # Ellipses, bullets and mid-sentence phrases
+        ("Good answer. Let's break it down... really. Next point.", "Good answer. Next point."),
+        ("• Practice STAR; this might help you. Keep answers short.", "• Keep answers short."),
+        ("Line one.\n• This might help.\n• Two", "Line one.\n• Two"),
+        ("Nothing banned here.", "Nothing banned here."),
+    ],
+)
+def test_strip_banned(text, expected):
+    assert _strip_banned(text) == expected